@@ -7,6 +7,8 @@ This script demonstrates the complete recommendation system functionality.
 
 import sys
 import os
+import numpy as np
+from scipy import sparse
 
 # Add src directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -24,9 +26,19 @@ def main():
     """Main function to demonstrate the recommendation system"""
     print("=== MyNextMovie Recommendation System ===")
     
+    # Stop early when the raw data is missing instead of failing inside the CSV parser
+    missing_files = [
+        name for name in ('movies.csv', 'ratings.csv')
+        if not os.path.isfile(os.path.join('data/raw', name))
+    ]
+    if missing_files:
+        print(f"\nMissing data files in data/raw/: {', '.join(missing_files)}")
+        print("Run 'python setup.py' for download instructions.")
+        return
+    
     # Initialize data loader
     print("\n1. Loading data...")
-    data_loader = DataLoader('data/raw')
+    data_loader = DataLoader('data/raw', cache_dir='data/processed')
     movies_df, ratings_df = data_loader.load_data()
     
     # Preprocess data
@@ -37,7 +49,13 @@ def main():
     print("\n3. Initializing recommendation engines...")
     pop_recommender = PopularityRecommender(movies_with_stats)
     content_recommender = ContentBasedRecommender(movies_df)
-    collab_recommender = CollaborativeFilteringRecommender(ratings_df, movies_df)
+    # Ratings go straight into a float32 COO matrix indexed by raw IDs, skipping the pivot
+    # (COO keeps duplicate ratings so from_sparse can average them like pivot_table)
+    ratings_matrix = sparse.coo_matrix((
+        ratings_df['rating'].to_numpy(dtype=np.float32),
+        (ratings_df['userId'].to_numpy(), ratings_df['movieId'].to_numpy())
+    ))
+    collab_recommender = CollaborativeFilteringRecommender.from_sparse(ratings_matrix, movies_df)
     hybrid_recommender = HybridRecommender(pop_recommender, content_recommender, collab_recommender)
     
     print("\n4. Testing recommendation systems...")
@@ -4,44 +4,139 @@ Setup script for Movie Recommendation System
 This script creates the necessary directory structure and provides setup instructions.
 """
 
+import hashlib
+import importlib.util
+import json
 import os
 import sys
+from dataclasses import dataclass, field
+from typing import Dict, Set
+
+# Project layout and requirements, built once at import
+DIRECTORIES = (
+    'data',
+    'data/raw',
+    'data/processed',
+    'screenshots'
+)
+
+# (pip package name, import name)
+REQUIRED_PACKAGES = (
+    ('streamlit', 'streamlit'),
+    ('pandas', 'pandas'),
+    ('numpy', 'numpy'),
+    ('scikit-learn', 'sklearn'),
+    ('plotly', 'plotly')
+)
+
+DATA_FILES = (
+    'data/raw/movies.csv',
+    'data/raw/ratings.csv'
+)
+
+DATA_URL = "https://www.kaggle.com/code/ayushimishra2809/movie-recommendationsystem/data?select=ratings.csv"
+
+# Result of the last successful run, keyed by a fingerprint of its inputs
+CACHE_FILE = '.setup_cache.json'
+
+# Prebuilt templates for the per-item status lines
+_DIR_CREATED = "✅ Created directory: {}".format
+_DIR_EXISTS = "📁 Directory already exists: {}".format
+_PKG_OK = "✅ {} is installed".format
+_PKG_MISSING = "❌ {} is NOT installed".format
+_FILE_OK = "✅ Data file found: {}".format
+_FILE_MISSING = "❌ Data file missing: {}".format
+
+@dataclass
+class SetupContext:
+    """Directory listings and package availability shared by the checks of one setup run."""
+    dir_listings: Dict[str, Set[str]] = field(default_factory=dict)
+    availability: Dict[str, bool] = field(default_factory=dict)
+    
+    def listing(self, directory):
+        """Names in a directory (empty if it does not exist), scanned once per run."""
+        if directory not in self.dir_listings:
+            try:
+                with os.scandir(directory) as entries:
+                    self.dir_listings[directory] = {entry.name for entry in entries}
+            except FileNotFoundError:
+                self.dir_listings[directory] = set()
+        return self.dir_listings[directory]
+    
+    def is_installed(self, module):
+        """Whether a module can be imported, probed once per run without importing it."""
+        if module not in self.availability:
+            self.availability[module] = importlib.util.find_spec(module) is not None
+        return self.availability[module]
+
+def path_exists(path):
+    """Check whether a path exists with a single lstat call (symlinks are not followed)."""
+    try:
+        os.lstat(path)
+        return True
+    except OSError:
+        return False
+
+def fingerprint():
+    """Hash the mtimes of everything a setup run depends on.
+    
+    Covers this script, the project directories, the data files and the
+    import path entries (installing or removing a package touches its
+    site-packages directory). The directory holding the cache file is left
+    out, since writing the cache changes its mtime.
+    
+    Returns:
+        str: Hex digest; changes whenever any of the inputs change
+    """
+    paths = {os.path.abspath(path) for path in (__file__,) + DIRECTORIES + DATA_FILES}
+    paths.update(os.path.abspath(entry) for entry in sys.path if entry)
+    paths.discard(os.path.dirname(os.path.abspath(CACHE_FILE)))
+    
+    stamps = []
+    for path in sorted(paths):
+        try:
+            stamps.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            stamps.append((path, None))
+    return hashlib.blake2b(str(stamps).encode()).hexdigest()
+
+def load_cache():
+    """Load the last run's cache, or an empty dict if it is missing or unreadable."""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """Write the cache, ignoring failures (the next run just repeats the checks)."""
+    try:
+        with open(CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
 
 def create_directories():
     """Create necessary directories for the project."""
-    directories = [
-        'data',
-        'data/raw',
-        'data/processed',
-        'screenshots'
-    ]
-    
-    for dir_path in directories:
-        if not os.path.exists(dir_path):
+    for dir_path in DIRECTORIES:
+        if not path_exists(dir_path):
             os.makedirs(dir_path)
-            print(f"✅ Created directory: {dir_path}")
+            print(_DIR_CREATED(dir_path))
         else:
-            print(f"📁 Directory already exists: {dir_path}")
+            print(_DIR_EXISTS(dir_path))
 
-def check_dependencies():
+def check_dependencies(context=None):
     """Check if required dependencies are installed."""
-    required_packages = [
-        'streamlit',
-        'pandas',
-        'numpy',
-        'scikit-learn',
-        'plotly'
-    ]
-    
+    context = context or SetupContext()
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package)
-            print(f"✅ {package} is installed")
-        except ImportError:
+    for package, module in REQUIRED_PACKAGES:
+        # find_spec only locates the module; nothing is imported or executed
+        if context.is_installed(module):
+            print(_PKG_OK(package))
+        else:
             missing_packages.append(package)
-            print(f"❌ {package} is NOT installed")
+            print(_PKG_MISSING(package))
     
     if missing_packages:
         print(f"\n🔧 Install missing packages with:")
@@ -50,25 +145,22 @@ def check_dependencies():
     
     return True
 
-def check_data_files():
+def check_data_files(context=None):
     """Check if data files are present."""
-    data_files = [
-        'data/raw/movies.csv',
-        'data/raw/ratings.csv'
-    ]
-    
+    # List each directory once and answer the per-file checks from memory
+    context = context or SetupContext()
     missing_files = []
     
-    for file_path in data_files:
-        if os.path.exists(file_path):
-            print(f"✅ Data file found: {file_path}")
+    for file_path in DATA_FILES:
+        if os.path.basename(file_path) in context.listing(os.path.dirname(file_path)):
+            print(_FILE_OK(file_path))
         else:
             missing_files.append(file_path)
-            print(f"❌ Data file missing: {file_path}")
+            print(_FILE_MISSING(file_path))
     
     if missing_files:
         print(f"\n📥 Download data files from:")
-        print(f"https://www.kaggle.com/code/ayushimishra2809/movie-recommendationsystem/data?select=ratings.csv")
+        print(DATA_URL)
         print(f"\nRequired files:")
         for file_path in missing_files:
             print(f"  - {file_path}")
@@ -78,24 +170,48 @@ def check_data_files():
 
 def main():
     """Main setup function."""
+    # Block-buffer stdout (line-buffered on a terminal) and flush once per section
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     print("🎬 Movie Recommendation System - Setup")
     print("=" * 50)
     
+    # Nothing changed since the last successful run: repeat its summary
+    fp = fingerprint()
+    cache = load_cache()
+    if cache.get('fp') == fp and cache.get('all_passed'):
+        print("\n♻️  No changes since the last successful setup run")
+        for file_path in DATA_FILES:
+            print(_FILE_OK(file_path))
+        print("\n" + "=" * 50)
+        print("🎉 Setup complete! You can now run:")
+        print("   streamlit run streamlit_app.py")
+        return
+    
+    context = SetupContext()
+    
     # Create directories
     print("\n📁 Creating directory structure...")
     create_directories()
+    sys.stdout.flush()
     
     # Check dependencies
     print("\n🔍 Checking Python dependencies...")
-    deps_ok = check_dependencies()
+    deps_ok = check_dependencies(context)
+    sys.stdout.flush()
     
     # Check data files
     print("\n📊 Checking data files...")
-    data_ok = check_data_files()
+    data_ok = check_data_files(context)
+    sys.stdout.flush()
     
     # Final status
     print("\n" + "=" * 50)
-    if deps_ok and data_ok:
+    all_passed = deps_ok and data_ok
+    # Directories created by this run change the fingerprint, so take it afresh
+    save_cache({'fp': fingerprint(), 'all_passed': all_passed})
+    if all_passed:
         print("🎉 Setup complete! You can now run:")
         print("   streamlit run streamlit_app.py")
     else:
@@ -107,7 +223,7 @@ def main():
         
         if not data_ok:
             print("\n2. Download data files from Kaggle:")
-            print("   https://www.kaggle.com/code/ayushimishra2809/movie-recommendationsystem/data?select=ratings.csv")
+            print(f"   {DATA_URL}")
             print("   Place movies.csv and ratings.csv in data/raw/ directory")
 
 if __name__ == "__main__":
@@ -6,30 +6,43 @@ This module handles loading and preprocessing of movie and rating data.
 
 import pandas as pd
 import numpy as np
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
+import hashlib
 import os
+import re
+import uuid
 
 class DataLoader:
     """Handles loading and preprocessing of movie recommendation data"""
     
-    def __init__(self, data_path: str = "../data/raw"):
+    def __init__(self, data_path: str = "../data/raw", cache_dir: Optional[str] = None):
         """
         Initialize DataLoader with data path
         
         Args:
             data_path (str): Path to raw data directory
+            cache_dir (str): Directory for cached movie statistics (Arrow IPC); no caching if None
         """
         self.data_path = data_path
+        self.cache_dir = cache_dir
         self.movies_df = None
         self.ratings_df = None
         self.movies_with_stats = None
         self.user_movie_matrix = None
         self.unique_genres = None
+        self._load_options = ()
         
-    def load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def load_data(self, movie_columns: Optional[List[str]] = None,
+                  rating_columns: Optional[List[str]] = None,
+                  dtypes: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Load movies and ratings datasets
         
+        Args:
+            movie_columns (List[str]): Columns to read from movies.csv (must include 'title'); all if None
+            rating_columns (List[str]): Columns to read from ratings.csv; all if None
+            dtypes (Dict[str, str]): Column dtypes applied while parsing, e.g. {'rating': 'float32'}
+            
         Returns:
             Tuple[pd.DataFrame, pd.DataFrame]: Movies and ratings dataframes
         """
@@ -37,15 +50,30 @@ class DataLoader:
             movies_path = os.path.join(self.data_path, "movies.csv")
             ratings_path = os.path.join(self.data_path, "ratings.csv")
             
-            self.movies_df = pd.read_csv(movies_path)
-            self.ratings_df = pd.read_csv(ratings_path)
-            
-            # Clean column names (remove any extra quotes or whitespace)
-            self.movies_df.columns = self.movies_df.columns.str.strip().str.strip("'\"")
-            self.ratings_df.columns = self.ratings_df.columns.str.strip().str.strip("'\"")
-            
-            # Separate movie title and year
-            self.movies_df = self._separate_title_and_year(self.movies_df)
+            # Reuse the parsed frames while the raw files and load options are unchanged
+            self._load_options = (movie_columns, rating_columns, dtypes)
+            movies_cache = self._cache_path("movies", self._load_options)
+            ratings_cache = self._cache_path("ratings", self._load_options)
+            cached_movies = self._read_cache(movies_cache) if movies_cache is not None else None
+            cached_ratings = self._read_cache(ratings_cache) if cached_movies is not None else None
+            if cached_ratings is not None:
+                self.movies_df = cached_movies
+                self.ratings_df = cached_ratings
+            else:
+                # Project columns and set dtypes in the parser, so unused columns are never materialized
+                self.movies_df = self._read_csv(movies_path, movie_columns, dtypes)
+                self.ratings_df = self._read_csv(ratings_path, rating_columns, dtypes)
+                
+                # Clean column names (remove any extra quotes or whitespace)
+                self.movies_df.columns = self.movies_df.columns.str.strip().str.strip("'\"")
+                self.ratings_df.columns = self.ratings_df.columns.str.strip().str.strip("'\"")
+                
+                # Separate movie title and year
+                self.movies_df = self._separate_title_and_year(self.movies_df)
+                
+                if movies_cache is not None:
+                    self._write_cache(self.movies_df, movies_cache)
+                    self._write_cache(self.ratings_df, ratings_cache)
             
             print(f"Movies loaded: {self.movies_df.shape[0]} records")
             print(f"Ratings loaded: {self.ratings_df.shape[0]} records")
@@ -56,6 +84,29 @@ class DataLoader:
             print(f"Error loading data: {e}")
             raise
     
+    def _read_csv(self, path: str, columns: Optional[List[str]],
+                  dtypes: Optional[Dict[str, str]]) -> pd.DataFrame:
+        """
+        Read a CSV file, matching requested columns and dtypes against the cleaned header
+        
+        Args:
+            path (str): CSV file path
+            columns (List[str]): Cleaned names of the columns to read; all if None
+            dtypes (Dict[str, str]): Column dtypes keyed by cleaned name
+            
+        Returns:
+            pd.DataFrame: Parsed dataframe (column names not yet cleaned)
+        """
+        if columns is None and dtypes is None:
+            return pd.read_csv(path)
+        
+        # Headers may be quoted or padded, so map cleaned names back to the raw ones
+        header = pd.read_csv(path, nrows=0).columns
+        raw_names = {name.strip().strip("'\""): name for name in header}
+        usecols = [raw_names.get(name, name) for name in columns] if columns is not None else None
+        dtype = {raw_names.get(name, name): kind for name, kind in dtypes.items()} if dtypes is not None else None
+        return pd.read_csv(path, usecols=usecols, dtype=dtype)
+    
     def _separate_title_and_year(self, movies_df: pd.DataFrame) -> pd.DataFrame:
         """
         Separate movie title and year into different columns
@@ -92,8 +143,15 @@ class DataLoader:
         if self.movies_df is None or self.ratings_df is None:
             raise ValueError("Data must be loaded first using load_data()")
             
-        # Create movie statistics
-        self._create_movie_statistics()
+        # Create movie statistics, reusing the cached copy while the raw files are unchanged
+        cache_path = self._cache_path("movies_stats", self._load_options)
+        cached_stats = self._read_cache(cache_path) if cache_path is not None else None
+        if cached_stats is not None:
+            self.movies_with_stats = cached_stats
+        else:
+            self._create_movie_statistics()
+            if cache_path is not None:
+                self._write_cache(self.movies_with_stats, cache_path)
         
         # Create user-movie matrix
         self._create_user_movie_matrix()
@@ -105,15 +163,114 @@ class DataLoader:
         
         return self.movies_with_stats
         
+    def _cache_path(self, name: str, options: Tuple = ()) -> Optional[str]:
+        """
+        Path of a cached frame for the current raw files
+        
+        Args:
+            name (str): Name of the cached frame
+            options (Tuple): Load options the frame depends on
+            
+        Returns:
+            Optional[str]: Cache file path keyed by the raw files' mtimes and the options, or None if caching is off
+        """
+        if self.cache_dir is None:
+            return None
+        
+        mtimes = [
+            os.stat(os.path.join(self.data_path, file_name)).st_mtime_ns
+            for file_name in ("movies.csv", "ratings.csv")
+        ]
+        key = hashlib.md5(str((mtimes, options)).encode()).hexdigest()[:8]
+        return os.path.join(self.cache_dir, f"{name}_{key}.arrow")
+    
+    def _read_cache(self, cache_path: str) -> Optional[pd.DataFrame]:
+        """
+        Read a cached frame through a memory map
+        
+        Args:
+            cache_path (str): Cache file path (Arrow IPC)
+            
+        Returns:
+            Optional[pd.DataFrame]: Cached dataframe, or None if the cache is missing or unreadable
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return None
+        
+        try:
+            table = pa.ipc.open_file(pa.memory_map(cache_path, 'r')).read_all()
+        except (OSError, pa.ArrowInvalid):
+            # Missing or damaged cache file: rebuild from the CSVs
+            return None
+        
+        # split_blocks keeps null-free numeric columns as views into the mapped
+        # file (page cache shared across processes); string columns are still copied
+        return table.to_pandas(split_blocks=True)
+    
+    def _write_cache(self, df: pd.DataFrame, cache_path: str) -> None:
+        """
+        Write a frame to the cache, skipping it if pyarrow is not installed,
+        and remove the frame's stale cache files from earlier raw files or options
+        
+        Args:
+            df (pd.DataFrame): Dataframe to cache
+            cache_path (str): Cache file path
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            print(f"Skipping cache: {e}")
+            return
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        # Write to a temporary file and rename it into place, so readers never
+        # see a partial file from an interrupted run or a concurrent writer
+        tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        
+        # Match only this frame's own keys ('movies_*' must not catch 'movies_stats_*')
+        current = os.path.basename(cache_path)
+        name = current.rsplit('_', 1)[0]
+        stale = re.compile(rf"{re.escape(name)}_[0-9a-f]{{8}}\.arrow")
+        for file_name in os.listdir(self.cache_dir):
+            if file_name != current and stale.fullmatch(file_name):
+                try:
+                    os.remove(os.path.join(self.cache_dir, file_name))
+                except OSError:
+                    pass
+    
     def _create_movie_statistics(self) -> None:
         """Create movie statistics including average rating and count"""
-        movie_stats = self.ratings_df.groupby('movieId').agg({
-            'rating': ['mean', 'count', 'std']
-        }).round(2)
+        ratings = self.ratings_df['rating'].to_numpy(dtype=np.float64)
+        rated = ~np.isnan(ratings)
+        ratings = ratings[rated]
+        
+        # Aggregate per movie with bincount over dense movie codes instead of a groupby
+        movie_ids, codes = np.unique(self.ratings_df['movieId'].to_numpy()[rated], return_inverse=True)
+        counts = np.bincount(codes)
+        means = np.bincount(codes, weights=ratings) / counts
+        squared_deviations = np.bincount(codes, weights=(ratings - means[codes]) ** 2)
+        
+        # Sample standard deviation, undefined for movies with a single rating
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stds = np.where(counts > 1, np.sqrt(squared_deviations / (counts - 1)), np.nan)
         
-        # Flatten column names
-        movie_stats.columns = ['avg_rating', 'num_ratings', 'rating_std']
-        movie_stats = movie_stats.reset_index()
+        movie_stats = pd.DataFrame({
+            'movieId': movie_ids,
+            'avg_rating': means.round(2),
+            'num_ratings': counts,
+            'rating_std': stds.round(2)
+        })
         
         # Merge with movies dataframe
         self.movies_with_stats = self.movies_df.merge(movie_stats, on='movieId', how='left')
@@ -9,12 +9,48 @@ This module implements three types of recommendation systems:
 
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Optional, Tuple
+from scipy import sparse
+from typing import List, Dict, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
+
+def _build_result(columns: Dict[str, np.ndarray],
+                  return_arrays: bool = False) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Package recommendation result columns
+    
+    Args:
+        columns (Dict[str, np.ndarray]): Pre-typed result columns
+        return_arrays (bool): Return the dict of arrays instead of a DataFrame
+        
+    Returns:
+        Union[pd.DataFrame, Dict[str, np.ndarray]]: Result as a DataFrame or dict of arrays
+    """
+    if return_arrays:
+        return columns
+    return pd.DataFrame.from_dict(columns, orient='columns')
+
+
+def _empty_result(column_names: List[str],
+                  return_arrays: bool = False) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Build an empty recommendation result with the given columns
+    
+    Args:
+        column_names (List[str]): Result column names
+        return_arrays (bool): Return a dict of empty arrays instead of a DataFrame
+        
+    Returns:
+        Union[pd.DataFrame, Dict[str, np.ndarray]]: Empty result
+    """
+    if return_arrays:
+        return {col: np.array([]) for col in column_names}
+    return pd.DataFrame(columns=column_names)
+
+
 class PopularityRecommender:
     """Popularity-based movie recommendation system"""
     
@@ -26,8 +62,33 @@ class PopularityRecommender:
             movies_with_stats (pd.DataFrame): Movies dataframe with statistics
         """
         self.movies_with_stats = movies_with_stats
+
+        # One-hot genre matrix (movies x genres), so genre filters combine
+        # boolean columns instead of re-scanning the pipe-separated strings
+        genre_dummies = movies_with_stats['genres'].str.get_dummies(sep='|')
+        self._genre_names = [name.lower() for name in genre_dummies.columns]
+        self._genre_matrix = genre_dummies.to_numpy(dtype=bool)
+
+    def _genre_mask(self, genre: str) -> np.ndarray:
+        """
+        Boolean mask of movies whose genres contain the given text (case-insensitive)
         
-    def recommend(self, genre: str, min_reviews_threshold: int, num_recommendations: int) -> pd.DataFrame:
+        Args:
+            genre (str): Genre, or part of a genre name, to filter on
+            
+        Returns:
+            np.ndarray: True for each matching movie
+        """
+        # Patterns that could span the '|' separator or act as regex fall back to a string scan
+        if any(char in genre for char in '|\\.^$*+?()[]{}'):
+            return self.movies_with_stats['genres'].str.contains(genre, case=False, na=False).to_numpy(dtype=bool)
+        
+        query = genre.lower()
+        matching = [i for i, name in enumerate(self._genre_names) if query in name]
+        return self._genre_matrix[:, matching].any(axis=1)
+        
+    def recommend(self, genre: str, min_reviews_threshold: int, num_recommendations: int,
+                  return_arrays: bool = False) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
         """
         Recommend top N popular movies within a specific genre
         
@@ -35,6 +96,7 @@ class PopularityRecommender:
             genre (str): Genre to filter movies
             min_reviews_threshold (int): Minimum number of reviews required
             num_recommendations (int): Number of recommendations to return
+            return_arrays (bool): Return a dict of column arrays instead of a DataFrame
             
         Returns:
             pd.DataFrame: Top N movies with S.No., Movie Title, Average Rating, and Num Reviews
@@ -42,36 +104,31 @@ class PopularityRecommender:
         # Filter movies by genre
         if genre and isinstance(genre, str):
             # Filter by genre if specified
-            genre_movies = self.movies_with_stats[
-                self.movies_with_stats['genres'].str.contains(genre, case=False, na=False)
-            ]
+            genre_movies = self.movies_with_stats[self._genre_mask(genre)]
         else:
-            # No genre filter - use all movies
-            genre_movies = self.movies_with_stats.copy()
+            # No genre filter - use all movies (the threshold filter below returns a new frame)
+            genre_movies = self.movies_with_stats
         
         # Filter by minimum reviews threshold
         popular_movies = genre_movies[genre_movies['num_ratings'] >= min_reviews_threshold]
         
         if len(popular_movies) == 0:
-            return pd.DataFrame(columns=['S.No.', 'Movie Title', 'Average Movie Rating', 'Num Reviews'])
+            return _empty_result(['S.No.', 'Movie Title', 'Average Movie Rating', 'Num Reviews'], return_arrays)
         
-        # Sort by average rating (descending) and then by number of ratings (descending)
-        popular_movies = popular_movies.sort_values(['avg_rating', 'num_ratings'], ascending=[False, False])
+        # Select top N by average rating, then number of ratings (both descending),
+        # without fully sorting the filtered movies
+        top_movies = popular_movies.nlargest(num_recommendations, ['avg_rating', 'num_ratings'])
         
-        # Select top N recommendations
-        top_movies = popular_movies.head(num_recommendations)
-        
-        # Create result dataframe
-        result = pd.DataFrame({
-            'S.No.': range(1, len(top_movies) + 1),
+        # Create result
+        n = len(top_movies)
+        return _build_result({
+            'S.No.': np.arange(1, n + 1, dtype=np.int32),
             'Movie Title': top_movies['title'].values,
             'Average Movie Rating': top_movies['avg_rating'].values,
-            'Num Reviews': top_movies['num_ratings'].astype(int).values,
-            'year': top_movies['year'].values if 'year' in top_movies.columns else [None] * len(top_movies),
-            'genres': top_movies['genres'].values if 'genres' in top_movies.columns else ['N/A'] * len(top_movies)
-        })
-        
-        return result
+            'Num Reviews': top_movies['num_ratings'].values.astype(int),
+            'year': top_movies['year'].values if 'year' in top_movies.columns else np.full(n, None, dtype=object),
+            'genres': top_movies['genres'].values if 'genres' in top_movies.columns else np.full(n, 'N/A', dtype=object)
+        }, return_arrays)
 
 
 class ContentBasedRecommender:
@@ -97,24 +154,92 @@ class ContentBasedRecommender:
             genres = genres_str.split('|')
             all_genres_set.update(genres)
         
-        # Create binary columns for each genre
-        self.movies_expanded = self.movies_df.copy()
+        # Create binary columns for each genre on a shallow copy, so the
+        # (possibly shared) movie data itself is not duplicated
+        self.movies_expanded = self.movies_df.copy(deep=False)
         for genre in all_genres_set:
             self.movies_expanded[f'genre_{genre}'] = self.movies_expanded['genres'].str.contains(genre, na=False).astype(int)
         
         self.genre_columns = [col for col in self.movies_expanded.columns if col.startswith('genre_')]
-        
-    def recommend(self, movie_title: str, num_recommendations: int) -> pd.DataFrame:
+        self._genre_features = self.movies_expanded[self.genre_columns].values
+
+        # Lowercase title -> row position for exact lookups (first occurrence wins)
+        self._title_lower_index = {}
+        for i, title in enumerate(self.movies_expanded['title'].values):
+            if isinstance(title, str):
+                self._title_lower_index.setdefault(title.lower(), i)
+
+    def recommend(self, movie_title: str, num_recommendations: int,
+                  return_arrays: bool = False) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
         """
         Recommend movies similar to a given movie based on genre similarity
         
         Args:
             movie_title (str): Title of the input movie (without year)
             num_recommendations (int): Number of recommendations to return
+            return_arrays (bool): Return a dict of column arrays instead of a DataFrame
             
         Returns:
             pd.DataFrame: Top N similar movies with S.No. and Movie Titles
         """
+        row = self._find_movie(movie_title)
+        if row is None:
+            print(f"Movie '{movie_title}' not found in the dataset.")
+            return _empty_result(['S.No.', 'Movie Title'], return_arrays)
+        
+        # Calculate similarity with all other movies
+        input_features = self._genre_features[row].reshape(1, -1)
+        similarity_scores = cosine_similarity(input_features, self._genre_features).flatten()
+        
+        return self._recommend_from_scores(row, similarity_scores, num_recommendations, return_arrays)
+
+    def recommend_many(self, movie_titles: List[str], num_recommendations: int,
+                       return_arrays: bool = False) -> Dict[str, Union[pd.DataFrame, Dict[str, np.ndarray]]]:
+        """
+        Recommend movies similar to each of several movies, scoring all of them
+        against the catalog in a single similarity computation
+        
+        Args:
+            movie_titles (List[str]): Titles of the input movies (without year)
+            num_recommendations (int): Number of recommendations per movie
+            return_arrays (bool): Return dicts of column arrays instead of DataFrames
+            
+        Returns:
+            Dict[str, pd.DataFrame]: Recommendations for each input title, as from recommend()
+        """
+        found_titles, rows = [], []
+        for movie_title in movie_titles:
+            row = self._find_movie(movie_title)
+            if row is None:
+                print(f"Movie '{movie_title}' not found in the dataset.")
+            else:
+                found_titles.append(movie_title)
+                rows.append(row)
+        
+        results = {}
+        if rows:
+            # One (inputs x movies) similarity matrix for all found titles
+            similarity_matrix = cosine_similarity(self._genre_features[rows], self._genre_features)
+            for movie_title, row, similarity_scores in zip(found_titles, rows, similarity_matrix):
+                results[movie_title] = self._recommend_from_scores(
+                    row, similarity_scores, num_recommendations, return_arrays
+                )
+        
+        return {
+            movie_title: results[movie_title] if movie_title in results else _empty_result(['S.No.', 'Movie Title'], return_arrays)
+            for movie_title in movie_titles
+        }
+
+    def _find_movie(self, movie_title: str) -> Optional[int]:
+        """
+        Find the row position of a movie by title
+        
+        Args:
+            movie_title (str): Title of the movie, with or without year
+            
+        Returns:
+            Optional[int]: Row position in movies_expanded, or None if not found
+        """
         # Clean the input movie title (remove year if present)
         clean_input_title = movie_title
         if '(' in clean_input_title and ')' in clean_input_title:
@@ -122,34 +247,36 @@ class ContentBasedRecommender:
         
         # Find the movie in the dataset (case-insensitive partial matching)
         # First try exact match
-        movie_matches = self.movies_expanded[
-            self.movies_expanded['title'].str.contains(f'^{clean_input_title}$', case=False, na=False, regex=True)
-        ]
-        
-        # If no exact match, try partial match
-        if len(movie_matches) == 0:
-            movie_matches = self.movies_expanded[
-                self.movies_expanded['title'].str.contains(clean_input_title, case=False, na=False)
-            ]
+        row = self._title_lower_index.get(clean_input_title.lower())
+        if row is not None:
+            return row
         
-        if len(movie_matches) == 0:
-            print(f"Movie '{movie_title}' not found in the dataset.")
-            return pd.DataFrame(columns=['S.No.', 'Movie Title'])
+        # If no exact match, try partial match; if multiple matches, take the first one
+        matches = np.flatnonzero(
+            self.movies_expanded['title'].str.contains(clean_input_title, case=False, na=False, regex=False).to_numpy(dtype=bool)
+        )
+        return int(matches[0]) if len(matches) else None
+
+    def _recommend_from_scores(self, row: int, similarity_scores: np.ndarray, num_recommendations: int,
+                               return_arrays: bool) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        Turn an input movie's similarity to every movie into top N recommendations
         
-        # If multiple matches, take the first one
-        input_movie = movie_matches.iloc[0]
+        Args:
+            row (int): Row position of the input movie
+            similarity_scores (np.ndarray): Similarity of the input movie to each movie
+            num_recommendations (int): Number of recommendations to return
+            return_arrays (bool): Return a dict of column arrays instead of a DataFrame
+            
+        Returns:
+            pd.DataFrame: Top N similar movies with S.No. and Movie Titles
+        """
+        input_movie = self.movies_expanded.iloc[row]
         input_movie_id = input_movie['movieId']
         
         print(f"Found movie: {input_movie['title']}")
         print(f"Genres: {input_movie['genres']}")
         
-        # Get genre features for the input movie
-        input_features = input_movie[self.genre_columns].values.reshape(1, -1)
-        
-        # Calculate similarity with all other movies
-        all_features = self.movies_expanded[self.genre_columns].values
-        similarity_scores = cosine_similarity(input_features, all_features).flatten()
-        
         # Create similarity dataframe
         similarity_df = pd.DataFrame({
             'movieId': self.movies_expanded['movieId'],
@@ -170,21 +297,24 @@ class ContentBasedRecommender:
         # Select top N recommendations
         top_similar = similarity_df.head(num_recommendations)
         
-        # Create result dataframe
-        result = pd.DataFrame({
-            'S.No.': range(1, len(top_similar) + 1),
+        # Create result
+        return _build_result({
+            'S.No.': np.arange(1, len(top_similar) + 1, dtype=np.int32),
             'Movie Title': top_similar['title'].values,
             'year': top_similar['year'].values,
             'genres': top_similar['genres'].values,
             'Average Movie Rating': top_similar['avg_rating'].values,
             'Num Reviews': top_similar['num_ratings'].values
-        })
-        
-        return result
+        }, return_arrays)
 
 
 class CollaborativeFilteringRecommender:
     """Collaborative filtering recommendation system using user-based approach"""
+
+    # Users per row-block in the similarity sweep. Blocks are views of the
+    # rating matrix, so this only bounds the peak temporary memory of the
+    # batch path: one (targets x tile) product and denominator at a time
+    SIMILARITY_TILE_ROWS = 4096
     
     def __init__(self, ratings_df: pd.DataFrame, movies_df: pd.DataFrame):
         """
@@ -198,8 +328,105 @@ class CollaborativeFilteringRecommender:
         self.movies_df = movies_df
         self.user_movie_matrix = None
         self.user_movie_matrix_filled = None
+        self._R_f32 = None
+        self._row_norms = None
         self._prepare_user_movie_matrix()
-        
+
+    @classmethod
+    def from_parquet(cls, ratings_path: str, movies_path: str,
+                     filters: Optional[List[Tuple]] = None) -> 'CollaborativeFilteringRecommender':
+        """
+        Build a collaborative filtering recommender straight from files on disk,
+        pushing column selection and row filters down to the reader
+
+        Args:
+            ratings_path (str): Path to ratings data (.parquet, or .csv via pyarrow.dataset)
+            movies_path (str): Path to preprocessed movies data (.parquet or .csv)
+            filters (List[Tuple]): Row filters in pyarrow DNF form, e.g. [('rating', '>=', 3.0)]
+
+        Returns:
+            CollaborativeFilteringRecommender: Recommender built from the filtered ratings
+        """
+        columns = ['userId', 'movieId', 'rating']
+
+        if ratings_path.endswith('.csv'):
+            # CSV has no statistics to prune on, but pyarrow.dataset still filters
+            # while scanning so dropped rows are never materialized in pandas
+            import pyarrow.dataset as ds
+            import pyarrow.parquet as pq
+
+            row_filter = ds.field('rating') > 0
+            if filters:
+                row_filter = row_filter & pq.filters_to_expression(filters)
+            ratings_df = ds.dataset(ratings_path, format='csv').to_table(
+                columns=columns, filter=row_filter
+            ).to_pandas()
+        else:
+            ratings_df = pd.read_parquet(ratings_path, columns=columns, filters=filters)
+
+        if movies_path.endswith('.csv'):
+            movies_df = pd.read_csv(movies_path)
+        else:
+            movies_df = pd.read_parquet(movies_path)
+
+        return cls(ratings_df, movies_df)
+
+    @classmethod
+    def from_sparse(cls, ratings_matrix, movies_df: pd.DataFrame,
+                    user_ids: Optional[np.ndarray] = None,
+                    movie_ids: Optional[np.ndarray] = None) -> 'CollaborativeFilteringRecommender':
+        """
+        Build a collaborative filtering recommender from a sparse users x movies
+        rating matrix, scattering it into the rating matrix instead of pivoting
+        a ratings dataframe
+
+        Like pivot_table, duplicate (user, movie) entries are averaged. Pass a
+        COO matrix to keep them: converting triplets to CSR sums duplicates.
+
+        Args:
+            ratings_matrix (scipy.sparse matrix): Ratings with users as rows and movies as columns
+            movies_df (pd.DataFrame): Movies dataframe
+            user_ids (np.ndarray): User ID of each row; row positions if None
+            movie_ids (np.ndarray): Movie ID of each column; column positions if None
+
+        Returns:
+            CollaborativeFilteringRecommender: Recommender over the stored ratings
+        """
+        # Average duplicate entries: CSR conversion sums them, so divide by the
+        # per-entry counts (both matrices share the same canonical structure)
+        entries = sparse.coo_matrix(ratings_matrix)
+        totals = entries.tocsr()
+        totals.sum_duplicates()
+        counts = sparse.csr_matrix(
+            (np.ones(entries.nnz, dtype=np.int32), (entries.row, entries.col)), shape=entries.shape
+        )
+        counts.sum_duplicates()
+        ratings = totals.tocoo()
+        ratings.data = ratings.data / counts.data.astype(ratings.dtype)
+        num_rows, num_cols = ratings.shape
+        user_ids = np.arange(num_rows) if user_ids is None else np.asarray(user_ids)
+        movie_ids = np.arange(num_cols) if movie_ids is None else np.asarray(movie_ids)
+
+        # Like pivot_table, keep only users and movies that have ratings
+        rows, row_codes = np.unique(ratings.row, return_inverse=True)
+        cols, col_codes = np.unique(ratings.col, return_inverse=True)
+        dense = np.full((len(rows), len(cols)), np.nan, dtype=np.result_type(ratings.dtype, np.float32))
+        dense[row_codes, col_codes] = ratings.data
+
+        recommender = cls.__new__(cls)
+        recommender.ratings_df = pd.DataFrame({
+            'userId': user_ids[ratings.row],
+            'movieId': movie_ids[ratings.col],
+            'rating': ratings.data
+        })
+        recommender.movies_df = movies_df
+        recommender._set_user_movie_matrix(pd.DataFrame(
+            dense,
+            index=pd.Index(user_ids[rows], name='userId'),
+            columns=pd.Index(movie_ids[cols], name='movieId')
+        ))
+        return recommender
+
     def _prepare_user_movie_matrix(self) -> None:
         """Prepare user-movie rating matrix"""
         # Handle different possible column names for rating
@@ -228,14 +455,78 @@ class CollaborativeFilteringRecommender:
         if user_col is None or movie_col is None:
             raise KeyError(f"Required columns not found. Available: {self.ratings_df.columns.tolist()}")
         
-        self.user_movie_matrix = self.ratings_df.pivot_table(
+        self._set_user_movie_matrix(self.ratings_df.pivot_table(
             index=user_col, 
             columns=movie_col, 
             values=rating_col
-        )
+        ))
+
+    def _set_user_movie_matrix(self, user_movie_matrix: pd.DataFrame) -> None:
+        """
+        Store the user-movie rating matrix and derive the similarity inputs
+        
+        Args:
+            user_movie_matrix (pd.DataFrame): Users x movies ratings, NaN where not rated
+        """
+        self.user_movie_matrix = user_movie_matrix
         self.user_movie_matrix_filled = self.user_movie_matrix.fillna(0)
+
+        # Contiguous float32 copy and per-user norms for the cosine similarity sweep
+        self._R_f32 = np.ascontiguousarray(self.user_movie_matrix_filled.values, dtype=np.float32)
+        self._row_norms = np.linalg.norm(self._R_f32, axis=1)
+
+    def _user_similarities(self, user_pos: int) -> np.ndarray:
+        """
+        Cosine similarity between one user and every user, computed in row tiles
+
+        Args:
+            user_pos (int): Row position of the target user in the rating matrix
+
+        Returns:
+            np.ndarray: Similarity of the target user to each user (0 for empty rows)
+        """
+        target = self._R_f32[user_pos]
+        target_norm = self._row_norms[user_pos]
+        num_users = self._R_f32.shape[0]
+        out = np.zeros(num_users)
+
+        if target_norm == 0:
+            return out
+
+        tile = self.SIMILARITY_TILE_ROWS
+        for offset in range(0, num_users, tile):
+            block = self._R_f32[offset:offset + tile]
+            denom = self._row_norms[offset:offset + tile] * target_norm
+            np.divide(block @ target, denom, out=out[offset:offset + tile], where=denom > 0)
+
+        return out
+
+    def _user_similarities_batch(self, user_positions: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity between several users and every user, sharing one
+        pass over the rating matrix tiles
+
+        Args:
+            user_positions (np.ndarray): Row positions of the target users
+
+        Returns:
+            np.ndarray: (targets x users) similarities (0 for empty rows)
+        """
+        targets = self._R_f32[user_positions]
+        target_norms = self._row_norms[user_positions]
+        num_users = self._R_f32.shape[0]
+        out = np.zeros((len(user_positions), num_users))
+
+        tile = self.SIMILARITY_TILE_ROWS
+        for offset in range(0, num_users, tile):
+            block = self._R_f32[offset:offset + tile]
+            denom = np.outer(target_norms, self._row_norms[offset:offset + tile])
+            np.divide(targets @ block.T, denom, out=out[:, offset:offset + tile], where=denom > 0)
+
+        return out
         
-    def recommend(self, user_id: int, num_recommendations: int, k_similar_users: int = 100) -> pd.DataFrame:
+    def recommend(self, user_id: int, num_recommendations: int, k_similar_users: int = 100,
+                  return_arrays: bool = False) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
         """
         Recommend movies based on K similar users for a target user
         
@@ -243,6 +534,7 @@ class CollaborativeFilteringRecommender:
             user_id (int): Target user ID
             num_recommendations (int): Number of recommendations to return
             k_similar_users (int): Number of similar users to consider
+            return_arrays (bool): Return a dict of column arrays instead of a DataFrame
             
         Returns:
             pd.DataFrame: Top N movie recommendations with S.No. and Movie Titles
@@ -250,14 +542,67 @@ class CollaborativeFilteringRecommender:
         # Check if user exists
         if user_id not in self.user_movie_matrix.index:
             print(f"User {user_id} not found in the dataset.")
-            return pd.DataFrame(columns=['S.No.', 'Movie Title'])
-        
-        # Get the target user's ratings
-        target_user_ratings = self.user_movie_matrix_filled.loc[user_id].values.reshape(1, -1)
+            return _empty_result(['S.No.', 'Movie Title'], return_arrays)
         
         # Calculate similarity with all other users
-        user_similarities = cosine_similarity(target_user_ratings, self.user_movie_matrix_filled.values).flatten()
+        user_similarities = self._user_similarities(self.user_movie_matrix.index.get_loc(user_id))
+        return self._recommend_from_similarities(
+            user_id, user_similarities, num_recommendations, k_similar_users, return_arrays
+        )
+
+    def recommend_batch(self, user_ids: List[int], num_recommendations: int,
+                        k_similar_users: int = 100,
+                        return_arrays: bool = False) -> Dict[int, Union[pd.DataFrame, Dict[str, np.ndarray]]]:
+        """
+        Recommend movies for several users, computing all their user similarities
+        in one batched pass instead of one matrix sweep per user
         
+        Args:
+            user_ids (List[int]): Target user IDs
+            num_recommendations (int): Number of recommendations per user
+            k_similar_users (int): Number of similar users to consider
+            return_arrays (bool): Return dicts of column arrays instead of DataFrames
+            
+        Returns:
+            Dict[int, pd.DataFrame]: Recommendations for each user ID, as from recommend()
+        """
+        known_users = []
+        for user_id in user_ids:
+            if user_id not in self.user_movie_matrix.index:
+                print(f"User {user_id} not found in the dataset.")
+            else:
+                known_users.append(user_id)
+        
+        results = {}
+        if known_users:
+            similarities = self._user_similarities_batch(self.user_movie_matrix.index.get_indexer(known_users))
+            for user_id, user_similarities in zip(known_users, similarities):
+                results[user_id] = self._recommend_from_similarities(
+                    user_id, user_similarities, num_recommendations, k_similar_users, return_arrays
+                )
+        
+        # Unknown users get the same empty result as recommend(); keep the input order
+        return {
+            user_id: results[user_id] if user_id in results else _empty_result(['S.No.', 'Movie Title'], return_arrays)
+            for user_id in user_ids
+        }
+
+    def _recommend_from_similarities(self, user_id: int, user_similarities: np.ndarray,
+                                     num_recommendations: int, k_similar_users: int,
+                                     return_arrays: bool) -> Union[pd.DataFrame, Dict[str, np.ndarray]]:
+        """
+        Turn a user's similarities to every user into top N recommendations
+        
+        Args:
+            user_id (int): Target user ID (must be in the rating matrix)
+            user_similarities (np.ndarray): Similarity of the target user to each user
+            num_recommendations (int): Number of recommendations to return
+            k_similar_users (int): Number of similar users to consider
+            return_arrays (bool): Return a dict of column arrays instead of a DataFrame
+            
+        Returns:
+            pd.DataFrame: Top N movie recommendations with S.No. and Movie Titles
+        """
         # Create similarity dataframe
         similarity_df = pd.DataFrame({
             'userId': self.user_movie_matrix_filled.index,
@@ -269,51 +614,49 @@ class CollaborativeFilteringRecommender:
         similarity_df = similarity_df.sort_values('similarity', ascending=False)
         
         # Get top K similar users
-        top_k_users = similarity_df.head(k_similar_users)['userId'].values
-        
+        top_k = similarity_df.head(k_similar_users)
+        top_k_users = top_k['userId'].values
+        top_k_similarities = top_k['similarity'].values
+
         print(f"Found {len(top_k_users)} similar users for User {user_id}")
         print(f"Top 5 similar users: {top_k_users[:5]}")
-        
-        # Get movies that the target user hasn't rated
-        target_user_rated_movies = self.user_movie_matrix.loc[user_id].dropna().index
-        all_movies = set(self.user_movie_matrix.columns)
-        unrated_movies = list(all_movies - set(target_user_rated_movies))
-        
-        # Calculate weighted average ratings for unrated movies
-        movie_scores = {}
-        
-        for movie_id in unrated_movies:
-            # Get ratings from similar users for this movie
-            similar_users_ratings = []
-            similar_users_similarities = []
-            
-            for sim_user_id in top_k_users:
-                if movie_id in self.user_movie_matrix.columns and sim_user_id in self.user_movie_matrix.index:
-                    rating = self.user_movie_matrix.loc[sim_user_id, movie_id]
-                    if pd.notna(rating):  # If the similar user has rated this movie
-                        user_sim = similarity_df[similarity_df['userId'] == sim_user_id]['similarity'].iloc[0]
-                        similar_users_ratings.append(rating)
-                        similar_users_similarities.append(user_sim)
-            
-            # Calculate weighted average if we have ratings
-            if len(similar_users_ratings) > 0:
-                # Check if all weights are zero
-                if sum(similar_users_similarities) == 0:
-                    # Use simple average if all similarities are zero
-                    weighted_rating = np.mean(similar_users_ratings)
-                else:
-                    weighted_rating = np.average(similar_users_ratings, weights=similar_users_similarities)
-                movie_scores[movie_id] = weighted_rating
-        
-        if len(movie_scores) == 0:
+
+        # Boolean mask of movies the target user has already rated
+        rated_mask = ~np.isnan(self.user_movie_matrix.loc[user_id].values)
+
+        # Ratings of the similar users (k x movies), NaN where not rated
+        neighbour_ratings = self.user_movie_matrix.loc[top_k_users].values
+        neighbour_rated = ~np.isnan(neighbour_ratings)
+        neighbour_ratings = np.where(neighbour_rated, neighbour_ratings, 0.0)
+
+        # Similarity-weighted average rating per movie over the neighbours who rated it
+        rating_counts = neighbour_rated.sum(axis=0)
+        weight_sums = top_k_similarities @ neighbour_rated
+        weighted_sums = top_k_similarities @ neighbour_ratings
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Use simple average where all similarities are zero
+            pred = np.where(
+                weight_sums > 0,
+                weighted_sums / weight_sums,
+                neighbour_ratings.sum(axis=0) / rating_counts
+            )
+
+        # Exclude movies already rated or not rated by any neighbour
+        pred[rated_mask | (rating_counts == 0)] = -np.inf
+        num_candidates = int(np.isfinite(pred).sum())
+
+        if num_candidates == 0:
             print("No recommendations could be generated.")
-            return pd.DataFrame(columns=['S.No.', 'Movie Title'])
-        
-        # Sort movies by predicted rating
-        sorted_movies = sorted(movie_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Get top N recommendations
-        top_movie_ids = [movie_id for movie_id, score in sorted_movies[:num_recommendations]]
+            return _empty_result(['S.No.', 'Movie Title'], return_arrays)
+
+        # Select top N by predicted rating without a full sort; ties at the
+        # cut-off are broken by movieId so results stay deterministic
+        n = min(num_recommendations, num_candidates)
+        cutoff = -np.partition(-pred, n - 1)[n - 1] if n > 0 else np.inf
+        top_idx = np.flatnonzero(pred >= cutoff)
+        top_idx = top_idx[np.argsort(-pred[top_idx], kind='stable')][:n]
+        top_movie_ids = self.user_movie_matrix.columns.values[top_idx].tolist()
         
         # Get movie titles
         recommended_movies = self.movies_df[self.movies_df['movieId'].isin(top_movie_ids)]
@@ -321,17 +664,16 @@ class CollaborativeFilteringRecommender:
         # Preserve the order of recommendations
         recommended_movies = recommended_movies.set_index('movieId').loc[top_movie_ids].reset_index()
         
-        # Create result dataframe
-        result = pd.DataFrame({
-            'S.No.': range(1, len(recommended_movies) + 1),
+        # Create result
+        n = len(recommended_movies)
+        return _build_result({
+            'S.No.': np.arange(1, n + 1, dtype=np.int32),
             'Movie Title': recommended_movies['title'].values,
-            'year': recommended_movies['year'].values if 'year' in recommended_movies.columns else [None] * len(recommended_movies),
-            'genres': recommended_movies['genres'].values if 'genres' in recommended_movies.columns else ['N/A'] * len(recommended_movies),
-            'Average Movie Rating': recommended_movies['avg_rating'].values if 'avg_rating' in recommended_movies.columns else [0] * len(recommended_movies),
-            'Num Reviews': recommended_movies['num_ratings'].values if 'num_ratings' in recommended_movies.columns else [0] * len(recommended_movies)
-        })
-        
-        return result
+            'year': recommended_movies['year'].values if 'year' in recommended_movies.columns else np.full(n, None, dtype=object),
+            'genres': recommended_movies['genres'].values if 'genres' in recommended_movies.columns else np.full(n, 'N/A', dtype=object),
+            'Average Movie Rating': recommended_movies['avg_rating'].values if 'avg_rating' in recommended_movies.columns else np.zeros(n),
+            'Num Reviews': recommended_movies['num_ratings'].values if 'num_ratings' in recommended_movies.columns else np.zeros(n, dtype=int)
+        }, return_arrays)
 
 
 class HybridRecommender:
@@ -352,6 +694,28 @@ class HybridRecommender:
         self.content_rec = content_rec
         self.collaborative_rec = collaborative_rec
         
+        # method -> (recommend function, required args, optional args with defaults, description)
+        self._dispatch = {
+            'popularity': (
+                self.popularity_rec.recommend,
+                ('genre', 'min_reviews_threshold', 'num_recommendations'),
+                {},
+                'popularity-based recommender'
+            ),
+            'content': (
+                self.content_rec.recommend,
+                ('movie_title', 'num_recommendations'),
+                {},
+                'content-based recommender'
+            ),
+            'collaborative': (
+                self.collaborative_rec.recommend,
+                ('user_id', 'num_recommendations'),
+                {'k_similar_users': 100},
+                'collaborative filtering recommender'
+            )
+        }
+        
     def recommend(self, method: str, **kwargs) -> pd.DataFrame:
         """
         Unified interface for all recommendation methods
@@ -363,41 +727,20 @@ class HybridRecommender:
         Returns:
             pd.DataFrame: Recommendations based on the specified method
         """
-        if method.lower() == 'popularity':
-            required_args = ['genre', 'min_reviews_threshold', 'num_recommendations']
-            if not all(arg in kwargs for arg in required_args):
-                raise ValueError(f"Missing required arguments for popularity-based recommender: {required_args}")
-            
-            return self.popularity_rec.recommend(
-                kwargs['genre'], 
-                kwargs['min_reviews_threshold'], 
-                kwargs['num_recommendations']
-            )
+        dispatch = self._dispatch.get(method.lower())
+        if dispatch is None:
+            raise ValueError("Invalid recommendation method. Choose from: 'popularity', 'content', 'collaborative'")
         
-        elif method.lower() == 'content':
-            required_args = ['movie_title', 'num_recommendations']
-            if not all(arg in kwargs for arg in required_args):
-                raise ValueError(f"Missing required arguments for content-based recommender: {required_args}")
-            
-            return self.content_rec.recommend(
-                kwargs['movie_title'], 
-                kwargs['num_recommendations']
-            )
+        recommend_fn, required_args, optional_args, description = dispatch
+        missing = [arg for arg in required_args if arg not in kwargs]
+        if missing:
+            raise ValueError(f"Missing required arguments for {description}: {list(required_args)}")
         
-        elif method.lower() == 'collaborative':
-            required_args = ['user_id', 'num_recommendations']
-            if not all(arg in kwargs for arg in required_args):
-                raise ValueError(f"Missing required arguments for collaborative filtering recommender: {required_args}")
-            
-            k_similar_users = kwargs.get('k_similar_users', 100)
-            return self.collaborative_rec.recommend(
-                kwargs['user_id'], 
-                kwargs['num_recommendations'], 
-                k_similar_users
-            )
+        call_args = {arg: kwargs[arg] for arg in required_args}
+        for arg, default in optional_args.items():
+            call_args[arg] = kwargs.get(arg, default)
         
-        else:
-            raise ValueError("Invalid recommendation method. Choose from: 'popularity', 'content', 'collaborative'")
+        return recommend_fn(**call_args)
     
     def get_combined_recommendations(self, user_id: int, num_recommendations: int, 
                                    weights: Dict[str, float] = None) -> pd.DataFrame:
@@ -415,62 +758,53 @@ class HybridRecommender:
         if weights is None:
             weights = {'collaborative': 0.6, 'popularity': 0.4}
         
-        # Get collaborative recommendations
-        collab_recs = self.collaborative_rec.recommend(user_id, num_recommendations * 2)
-        
-        # Get popular movies (assuming user likes popular content)
-        # This is a simplified approach - in practice, you'd use user's genre preferences
-        pop_recs = self.popularity_rec.recommend('Drama', 20, num_recommendations * 2)
-        
-        # Simple weighted combination (this could be more sophisticated)
-        combined_movies = []
-        
-        # Add collaborative recommendations with weight
-        if not collab_recs.empty:
-            for _, row in collab_recs.iterrows():
-                combined_movies.append({
-                    'title': row['Movie Title'],
-                    'year': row.get('year', ''),
-                    'genres': row.get('genres', 'N/A'),
-                    'avg_rating': row.get('Average Movie Rating', 0),
-                    'num_reviews': row.get('Num Reviews', 0),
-                    'score': weights.get('collaborative', 0.6),
-                    'source': 'collaborative'
-                })
-        
-        # Add popularity recommendations with weight
-        if not pop_recs.empty:
-            for _, row in pop_recs.iterrows():
-                combined_movies.append({
-                    'title': row['Movie Title'],
-                    'year': row.get('year', ''),
-                    'genres': row.get('genres', 'N/A'),
-                    'avg_rating': row.get('Average Movie Rating', 0),
-                    'num_reviews': row.get('Num Reviews', 0),
-                    'score': weights.get('popularity', 0.4),
-                    'source': 'popularity'
-                })
-        
-        # Remove duplicates and sort by score
-        seen_titles = set()
-        unique_movies = []
-        for movie in combined_movies:
-            if movie['title'] not in seen_titles:
-                unique_movies.append(movie)
-                seen_titles.add(movie['title'])
-        
-        # Sort by score and take top N
-        unique_movies.sort(key=lambda x: x['score'], reverse=True)
-        top_movies = unique_movies[:num_recommendations]
+        # The two sources are independent and their NumPy work releases the GIL,
+        # so run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Get collaborative recommendations
+            collab_future = executor.submit(
+                self.collaborative_rec.recommend, user_id, num_recommendations * 2, return_arrays=True
+            )
+            
+            # Get popular movies (assuming user likes popular content)
+            # This is a simplified approach - in practice, you'd use user's genre preferences
+            pop_future = executor.submit(
+                self.popularity_rec.recommend, 'Drama', 20, num_recommendations * 2, return_arrays=True
+            )
+            
+            collab_recs = collab_future.result()
+            pop_recs = pop_future.result()
+        
+        # Simple weighted combination (this could be more sophisticated):
+        # stack both sources into flat arrays, collaborative first
+        columns = ['Movie Title', 'year', 'genres', 'Average Movie Rating', 'Num Reviews']
+        sources = [
+            (recs, score) for recs, score in [
+                (collab_recs, weights.get('collaborative', 0.6)),
+                (pop_recs, weights.get('popularity', 0.4))
+            ]
+            if len(recs['Movie Title']) > 0
+        ]
+        if not sources:
+            return _empty_result(['S.No.'] + columns)
+        
+        combined = {
+            col: np.concatenate([np.asarray(recs[col], dtype=object) for recs, _ in sources])
+            for col in columns
+        }
+        scores = np.concatenate([np.full(len(recs['Movie Title']), score) for recs, score in sources])
+        
+        # Remove duplicates (first occurrence wins) and sort by score, keeping
+        # the source order among equal scores
+        _, first_seen = np.unique(combined['Movie Title'].astype(str), return_index=True)
+        first_seen = np.sort(first_seen)
+        order = np.argsort(-scores[first_seen], kind='stable')
+        top = first_seen[order][:num_recommendations]
         
         # Create result dataframe
         result = pd.DataFrame({
-            'S.No.': range(1, len(top_movies) + 1),
-            'Movie Title': [movie['title'] for movie in top_movies],
-            'year': [movie['year'] for movie in top_movies],
-            'genres': [movie['genres'] for movie in top_movies],
-            'Average Movie Rating': [movie['avg_rating'] for movie in top_movies],
-            'Num Reviews': [movie['num_reviews'] for movie in top_movies]
+            'S.No.': range(1, len(top) + 1),
+            **{col: combined[col][top].tolist() for col in columns}
         })
         
         return result
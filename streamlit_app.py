@@ -2,12 +2,28 @@ import streamlit as st
 import pandas as pd
 import sys
 import os
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
-# Add src directory to path
-sys.path.append('src')
+# Optional: downsample large Plotly traces (LTTB) before they are serialized
+try:
+    from plotly_resampler import register_plotly_resampler
+    register_plotly_resampler(mode='auto')
+except ImportError:
+    pass
+
+# Optional: Arrow-backed string columns for titles and genres
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = 'string[pyarrow]'
+except ImportError:
+    STRING_DTYPE = None
+
+# Add src directory to path (once; the script re-executes on every rerun)
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
 from data_loader import DataLoader
 from recommendation_engine import (
@@ -25,381 +41,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Enhanced Netflix-inspired CSS
-netflix_css = """
-<style>
-    /* Import better fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Space+Grotesk:wght@400;500;600;700&display=swap');
-    
-    /* Root variables for consistent theming */
-    :root {
-        --netflix-red: #e50914;
-        --netflix-dark-red: #b20710;
-        --netflix-black: #141414;
-        --netflix-dark-gray: #2d2d2d;
-        --netflix-gray: #564d4d;
-        --netflix-light-gray: #b3b3b3;
-        --netflix-white: #ffffff;
-        --netflix-background: #0a0a0a;
-        --netflix-card-bg: #1f1f1f;
-    }
-    
-    /* Global styles */
-    .main > div {
-        background: linear-gradient(135deg, var(--netflix-background) 0%, var(--netflix-black) 100%);
-        min-height: 100vh;
-    }
-    
-    /* Hide Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Sidebar styling */
-    .css-1d391kg, .css-1cypcdb {
-        background: linear-gradient(180deg, var(--netflix-black) 0%, var(--netflix-background) 100%);
-        border-right: 2px solid var(--netflix-dark-gray);
-    }
-    
-    /* Custom header */
-    .cinema-header {
-        background: linear-gradient(135deg, var(--netflix-black) 0%, var(--netflix-dark-gray) 100%);
-        padding: 2rem;
-        border-radius: 12px;
-        margin-bottom: 2rem;
-        text-align: center;
-        border: 1px solid var(--netflix-dark-gray);
-        box-shadow: 0 10px 30px rgba(0,0,0,0.5);
-    }
-    
-    .cinema-title {
-        color: var(--netflix-white);
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin: 0;
-        text-shadow: 2px 2px 8px rgba(0,0,0,0.8);
-    }
-    
-    .cinema-subtitle {
-        color: var(--netflix-light-gray);
-        font-family: 'Inter', sans-serif;
-        font-size: 1.1rem;
-        margin: 0.5rem 0 0 0;
-        opacity: 0.9;
-        font-weight: 400;
-    }
-    
-    .cinema-accent {
-        color: var(--netflix-red);
-    }
-    
-    /* Headers */
-    h1, h2, h3, h4, h5, h6 {
-        color: var(--netflix-white) !important;
-        font-family: 'Space Grotesk', sans-serif;
-        font-weight: 600;
-    }
-    
-    h1 { color: var(--netflix-red) !important; }
-    h2 { color: var(--netflix-red) !important; }
-    
-    /* Movie cards */
-    .movie-card {
-        background: linear-gradient(145deg, var(--netflix-card-bg) 0%, var(--netflix-dark-gray) 100%);
-        border: 1px solid var(--netflix-gray);
-        border-radius: 12px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: 0 4px 20px rgba(0,0,0,0.3);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    .movie-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: linear-gradient(90deg, var(--netflix-red), var(--netflix-dark-red));
-        opacity: 0;
-        transition: opacity 0.3s ease;
-    }
-    
-    .movie-card:hover {
-        border-color: var(--netflix-red);
-        box-shadow: 0 8px 30px rgba(229,9,20,0.4);
-        transform: translateY(-4px);
-    }
-    
-    .movie-card:hover::before {
-        opacity: 1;
-    }
-    
-    .movie-title {
-        color: var(--netflix-white);
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 1.2rem;
-        font-weight: 600;
-        margin-bottom: 0.5rem;
-        line-height: 1.3;
-    }
-    
-    .movie-details {
-        color: var(--netflix-light-gray);
-        font-family: 'Inter', sans-serif;
-        font-size: 0.9rem;
-        margin-top: 1rem;
-    }
-    
-    .movie-year-badge {
-        background: linear-gradient(135deg, var(--netflix-red), var(--netflix-dark-red));
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-size: 0.8rem;
-        font-weight: 600;
-        display: inline-block;
-        margin: 0.5rem 0;
-    }
-    
-    .rating-section {
-        margin-bottom: 0.8rem;
-    }
-    
-    .movie-rating {
-        color: var(--netflix-red);
-        font-weight: 600;
-        font-family: 'Inter', sans-serif;
-        font-size: 1rem;
-    }
-    
-    .info-section {
-        display: flex;
-        flex-direction: column;
-        gap: 0.4rem;
-    }
-    
-    .movie-reviews {
-        color: var(--netflix-light-gray);
-        font-size: 0.85rem;
-    }
-    
-    .movie-genre {
-        color: var(--netflix-light-gray);
-        font-size: 0.85rem;
-        font-style: italic;
-    }
-    
-    .movie-year {
-        background: var(--netflix-dark-gray);
-        color: var(--netflix-light-gray);
-        padding: 0.2rem 0.5rem;
-        border-radius: 4px;
-        font-size: 0.8rem;
-        font-weight: 500;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, var(--netflix-red) 0%, var(--netflix-dark-red) 100%);
-        color: var(--netflix-white);
-        border: none;
-        border-radius: 8px;
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-        padding: 0.75rem 2rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(229,9,20,0.3);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(135deg, var(--netflix-dark-red) 0%, #900c0c 100%);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(229,9,20,0.5);
-    }
-    
-    /* Form inputs */
-    .stSelectbox > div > div, .stTextInput > div > div > input, .stNumberInput > div > div > input {
-        background-color: var(--netflix-dark-gray) !important;
-        border: 1px solid var(--netflix-gray) !important;
-        color: var(--netflix-white) !important;
-        border-radius: 8px !important;
-        font-family: 'Inter', sans-serif;
-    }
-    
-    .stSelectbox > div > div:focus-within, .stTextInput > div > div:focus-within {
-        border-color: var(--netflix-red) !important;
-        box-shadow: 0 0 0 1px var(--netflix-red) !important;
-    }
-    
-    /* Metrics */
-    .metric-card {
-        background: linear-gradient(135deg, var(--netflix-card-bg) 0%, var(--netflix-dark-gray) 100%);
-        border: 1px solid var(--netflix-gray);
-        border-radius: 12px;
-        padding: 1.5rem;
-        text-align: center;
-        margin: 0.5rem;
-        transition: transform 0.3s ease;
-        box-shadow: 0 4px 15px rgba(0,0,0,0.3);
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-2px);
-    }
-    
-    .metric-value {
-        color: var(--netflix-red);
-        font-family: 'Space Grotesk', sans-serif;
-        font-size: 2.2rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-    }
-    
-    .metric-label {
-        color: var(--netflix-light-gray);
-        font-family: 'Inter', sans-serif;
-        font-size: 0.9rem;
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-    }
-    
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        background: var(--netflix-dark-gray);
-        border-radius: 8px;
-        padding: 0.25rem;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: transparent;
-        color: var(--netflix-light-gray);
-        border-radius: 6px;
-        font-family: 'Inter', sans-serif;
-        font-weight: 500;
-        padding: 12px 24px !important;
-        margin: 0 4px;
-        min-width: 180px;
-        text-align: center;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: var(--netflix-red) !important;
-        color: var(--netflix-white) !important;
-        padding: 12px 28px !important;
-        box-shadow: 0 2px 8px rgba(229, 9, 20, 0.3);
-    }
-    
-    /* Messages */
-    .stSuccess {
-        background: linear-gradient(135deg, rgba(0, 255, 0, 0.1), rgba(0, 200, 0, 0.1));
-        border: 1px solid #00cc00;
-        color: #00ff00;
-        border-radius: 8px;
-    }
-    
-    .stInfo {
-        background: linear-gradient(135deg, rgba(229, 9, 20, 0.1), rgba(180, 7, 16, 0.1));
-        border: 1px solid var(--netflix-red);
-        color: var(--netflix-red);
-        border-radius: 8px;
-    }
-    
-    .stWarning {
-        background: linear-gradient(135deg, rgba(255, 193, 7, 0.1), rgba(255, 152, 0, 0.1));
-        border: 1px solid #ffc107;
-        color: #ffc107;
-        border-radius: 8px;
-    }
-    
-    /* Tables */
-    .dataframe {
-        background-color: var(--netflix-card-bg) !important;
-        color: var(--netflix-white) !important;
-        border-radius: 8px !important;
-        overflow: hidden !important;
-    }
-    
-    .dataframe th {
-        background-color: var(--netflix-red) !important;
-        color: var(--netflix-white) !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 600 !important;
-        border: none !important;
-    }
-    
-    .dataframe td {
-        background-color: var(--netflix-card-bg) !important;
-        color: var(--netflix-white) !important;
-        border-bottom: 1px solid var(--netflix-gray) !important;
-        font-family: 'Inter', sans-serif !important;
-    }
-    
-    /* Sidebar labels */
-    .css-qrbaxs, .css-1cpxqw2 {
-        color: var(--netflix-white) !important;
-        font-family: 'Inter', sans-serif !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Welcome section */
-    .welcome-section {
-        background: linear-gradient(135deg, var(--netflix-card-bg) 0%, var(--netflix-dark-gray) 100%);
-        border: 1px solid var(--netflix-gray);
-        border-radius: 12px;
-        padding: 2rem;
-        margin: 1rem 0;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.3);
-    }
-    
-    .feature-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-        gap: 1rem;
-        margin: 1.5rem 0;
-    }
-    
-    .feature-card {
-        background: var(--netflix-dark-gray);
-        border: 1px solid var(--netflix-gray);
-        border-radius: 8px;
-        padding: 1.5rem;
-        text-align: center;
-        transition: transform 0.3s ease;
-    }
-    
-    .feature-card:hover {
-        transform: translateY(-2px);
-        border-color: var(--netflix-red);
-    }
-    
-    .feature-icon {
-        font-size: 2rem;
-        margin-bottom: 1rem;
-    }
-    
-    .feature-title {
-        color: var(--netflix-white);
-        font-family: 'Space Grotesk', sans-serif;
-        font-weight: 600;
-        margin-bottom: 0.5rem;
-    }
-    
-    .feature-desc {
-        color: var(--netflix-light-gray);
-        font-family: 'Inter', sans-serif;
-        font-size: 0.9rem;
-        line-height: 1.4;
-    }
-</style>
+# Enhanced Netflix-inspired CSS (see static/netflix.css)
+# Google Fonts are linked rather than @import-ed so the font request doesn't block the stylesheet
+font_links = """
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link rel="stylesheet" href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Space+Grotesk:wght@400;500;600;700&display=swap">
 """
 
-st.markdown(netflix_css, unsafe_allow_html=True)
+@st.cache_resource
+def load_netflix_css():
+    """Read the Netflix-inspired stylesheet from disk once per process"""
+    css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'netflix.css')
+    with open(css_path, encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
+
+# Streamlit drops elements that are not re-emitted on a rerun, so the style
+# tag is sent every run; only the file read is cached
+st.markdown(load_netflix_css() + font_links, unsafe_allow_html=True)
 
 # Enhanced header
 st.markdown("""
@@ -409,70 +68,158 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Temporarily disable cache to pick up data loader fixes
-# @st.cache_data
+def dataset_summary(movies_stats):
+    """Compute dataset-wide metrics shown on the analytics dashboard"""
+    # Use correct column names
+    rating_col = 'avg_rating' if 'avg_rating' in movies_stats.columns else 'Average Movie Rating'
+    reviews_col = 'num_ratings' if 'num_ratings' in movies_stats.columns else 'Num Reviews'
+    return {
+        'total_movies': len(movies_stats),
+        'avg_rating': float(movies_stats[rating_col].mean()),
+        'total_reviews': int(movies_stats[reviews_col].sum())
+    }
+
+def get_data_version():
+    """Identify the current data snapshot by the mtimes of the raw CSVs and the loader source"""
+    paths = [os.path.join('data/raw', name) for name in ('movies.csv', 'ratings.csv')]
+    paths.append(os.path.join(SRC_DIR, 'data_loader.py'))
+    return tuple(os.path.getmtime(path) for path in paths)
+
+# Only the current data version is kept in memory; across restarts the parsed
+# frames come from DataLoader's Arrow cache, which drops superseded versions
+@st.cache_data(ttl=None, max_entries=1, show_spinner=False)
+def _load_raw(data_version):
+    """Load and preprocess movie data (cached in memory, keyed by data version)"""
+    data_loader = DataLoader('data/raw', cache_dir='data/processed')
+    # The app never reads rating timestamps, so skip parsing that column, and
+    # parse IDs and ratings as 32-bit to halve the ratings frame and rating matrix
+    movies, ratings = data_loader.load_data(
+        rating_columns=['userId', 'movieId', 'rating'],
+        dtypes={'userId': 'int32', 'movieId': 'int32', 'rating': 'float32'}
+    )
+    movies_stats = data_loader.preprocess_data()
+    
+    # Store titles and genres as native UTF-8 buffers rather than Python objects
+    if STRING_DTYPE is not None:
+        for col in ('genres', 'movie_name'):
+            movies_stats[col] = movies_stats[col].astype(STRING_DTYPE)
+    
+    # Precompute the sorted genre list once instead of on every sidebar render
+    genres = tuple(sorted(
+        movies_stats['genres'].dropna().str.split('|').explode().str.strip().unique()
+    ))
+    
+    # Movie titles (and a lowercase copy) for the content-based search box
+    titles = movies_stats['movie_name'].dropna().to_numpy(dtype=str)
+    
+    # Highest rated movies for the welcome screen
+    rating_col = 'avg_rating' if 'avg_rating' in movies_stats.columns else 'Average Movie Rating'
+    top_rated = movies_stats.nlargest(50, rating_col).reset_index(drop=True)
+    
+    precomputed = {
+        'genres': genres,
+        'titles': titles,
+        'titles_lower': np.char.lower(titles),
+        'data_version': data_version,
+        'max_user_id': int(ratings['userId'].max()),
+        'top_rated': top_rated,
+        'summary': dataset_summary(movies_stats)
+    }
+    return movies, ratings, movies_stats, precomputed
+
 def load_movie_data():
-    """Load and cache movie data"""
+    """Load cached movie data and wrap it in a lightweight DataLoader"""
     try:
+        # Computed outside the cached loader so replaced files invalidate it
+        movies, ratings, movies_stats, precomputed = _load_raw(get_data_version())
         data_loader = DataLoader('data/raw')
-        movies, ratings = data_loader.load_data()
-        movies_stats = data_loader.preprocess_data()
-        return movies, ratings, movies_stats, data_loader
+        data_loader.movies_df = movies
+        data_loader.ratings_df = ratings
+        data_loader.movies_with_stats = movies_stats
+        return movies, ratings, movies_stats, data_loader, precomputed
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        return None, None, None, None
+        return None, None, None, None, None
 
-@st.cache_data
-def get_available_genres(_movies_stats):
-    """Get list of available genres"""
-    genres = set()
-    for genre_list in _movies_stats['genres'].dropna():
-        genres.update([g.strip() for g in genre_list.split('|')])
-    return sorted(list(genres))
+# Recommender factories: built once per data version and shared across reruns.
+# Frames are passed with a leading underscore so Streamlit doesn't hash them.
+@st.cache_resource(show_spinner=False)
+def get_popularity_rec(data_version, _movies_stats):
+    """Get cached popularity-based recommender"""
+    return PopularityRecommender(_movies_stats)
 
-def create_movie_card(movie_data):
-    """Create a professional movie card"""
-    # Handle different column naming conventions from different recommenders
-    title = (movie_data.get('Movie Title') or 
-             movie_data.get('movie_name') or 
-             movie_data.get('title') or 
-             'Unknown Movie')
-    
-    year = movie_data.get('year', 'N/A')
-    
-    rating = (movie_data.get('Average Movie Rating') or 
-              movie_data.get('avg_rating') or 
-              0)
-    
-    reviews = (movie_data.get('Num Reviews') or 
-               movie_data.get('num_ratings') or 
-               0)
+@st.cache_resource(show_spinner=False)
+def get_content_rec(data_version, _movies_stats):
+    """Get cached content-based recommender"""
+    return ContentBasedRecommender(_movies_stats)
+
+@st.cache_resource(show_spinner=False)
+def get_collab_rec(data_version, _ratings, _movies_stats):
+    """Get cached collaborative filtering recommender"""
+    return CollaborativeFilteringRecommender(_ratings, _movies_stats)
+
+@st.cache_resource(show_spinner=False)
+def get_hybrid_rec(data_version, _ratings, _movies_stats):
+    """Get cached hybrid recommender composed from the cached recommenders"""
+    return HybridRecommender(
+        get_popularity_rec(data_version, _movies_stats),
+        get_content_rec(data_version, _movies_stats),
+        get_collab_rec(data_version, _ratings, _movies_stats)
+    )
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def cached_recommend(data_version, rec_type, _recommender, method, *args):
+    """Memoize recommendation results by data version, type and parameters"""
+    return getattr(_recommender, method)(*args)
+
+def create_movie_cards(recommendations):
+    """
+    Create professional movie cards for all recommendations at once
     
-    genres = movie_data.get('genres', 'N/A')
+    Args:
+        recommendations (pd.DataFrame): Recommendations from any recommender
+        
+    Returns:
+        List[str]: Card HTML, one entry per row
+    """
+    # Handle different column naming conventions from different recommenders
+    def column(names, default):
+        for name in names:
+            if name in recommendations.columns:
+                return recommendations[name].astype(object).fillna(default)
+        return pd.Series(default, index=recommendations.index, dtype=object)
+    
+    titles = column(['Movie Title', 'movie_name', 'title'], 'Unknown Movie').astype(str)
+    years = column(['year'], 'N/A').astype(str)
+    ratings = pd.to_numeric(column(['Average Movie Rating', 'avg_rating'], 0), errors='coerce').fillna(0)
+    reviews = pd.to_numeric(column(['Num Reviews', 'num_ratings'], 0), errors='coerce').fillna(0).astype(int)
+    genres = column(['genres'], 'N/A').astype(str)
     
     # Truncate long genre lists
-    if len(str(genres)) > 40:
-        genres = str(genres)[:37] + "..."
+    genres = genres.where(genres.str.len() <= 40, genres.str[:37] + "...")
     
-    # Generate star rating
-    star_rating = "⭐" * int(rating) if rating > 0 else "☆☆☆☆☆"
+    # Generate star ratings
+    stars = pd.Series("⭐", index=recommendations.index).str.repeat(ratings.astype(int).clip(lower=0).tolist())
+    stars = stars.where(ratings > 0, "☆☆☆☆☆")
     
-    card_html = f"""
+    cards = (
+        """
     <div class="movie-card">
-        <div class="movie-title">{title}</div>
-        <div class="movie-year-badge">📅 {year}</div>
+        <div class="movie-title">""" + titles + """</div>
+        <div class="movie-year-badge">📅 """ + years + """</div>
         <div class="movie-details">
             <div class="rating-section">
-                <span class="movie-rating">{star_rating} {rating:.1f}/5</span>
+                <span class="movie-rating">""" + stars + " " + ratings.map("{:.1f}".format) + """/5</span>
             </div>
             <div class="info-section">
-                <span class="movie-reviews">👥 {int(reviews):,} reviews</span>
-                <span class="movie-genre">🎭 {genres}</span>
+                <span class="movie-reviews">👥 """ + reviews.map("{:,}".format) + """ reviews</span>
+                <span class="movie-genre">🎭 """ + genres + """</span>
             </div>
         </div>
     </div>
     """
-    return card_html
+    )
+    return cards.tolist()
 
 def display_recommendations_grid(recommendations, title):
     """Display recommendations in a grid layout"""
@@ -482,70 +229,44 @@ def display_recommendations_grid(recommendations, title):
         st.warning("No recommendations found. Try adjusting your criteria.")
         return
     
+    # Build every card in one pass and split them across the two grid columns
+    cards = create_movie_cards(recommendations)
+    column_cards = [cards[0::2], cards[1::2]]
+
     # Create columns for grid layout
     cols = st.columns(2)
-    
-    for idx, (_, movie) in enumerate(recommendations.iterrows()):
-        col = cols[idx % 2]
-        with col:
-            st.markdown(create_movie_card(movie), unsafe_allow_html=True)
 
-def create_analytics_dashboard(movies_stats, recommendations):
-    """Create analytics dashboard"""
+    for col, cards in zip(cols, column_cards):
+        col.markdown("".join(cards), unsafe_allow_html=True)
+
+def create_analytics_dashboard(summary, recommendations):
+    """Create analytics dashboard from precomputed dataset summary"""
     st.markdown("### 📊 Analytics Dashboard")
     
-    # Metrics row
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{:,}</div>
-            <div class="metric-label">Total Movies</div>
-        </div>
-        """.format(len(movies_stats)), unsafe_allow_html=True)
-    
-    with col2:
-        # Use correct column name
-        rating_col = 'avg_rating' if 'avg_rating' in movies_stats.columns else 'Average Movie Rating'
-        avg_rating = movies_stats[rating_col].mean()
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{:.1f}</div>
-            <div class="metric-label">Avg Rating</div>
-        </div>
-        """.format(avg_rating), unsafe_allow_html=True)
-    
-    with col3:
-        # Use correct column name
-        reviews_col = 'num_ratings' if 'num_ratings' in movies_stats.columns else 'Num Reviews'
-        total_reviews = movies_stats[reviews_col].sum()
-        st.markdown("""
-        <div class="metric-card">
-            <div class="metric-value">{:,}</div>
-            <div class="metric-label">Total Reviews</div>
-        </div>
-        """.format(int(total_reviews)), unsafe_allow_html=True)
-    
-    with col4:
-        if not recommendations.empty:
-            # Use correct column name for recommendations
-            rec_rating_col = 'avg_rating' if 'avg_rating' in recommendations.columns else 'Average Movie Rating'
-            if rec_rating_col in recommendations.columns:
-                rec_avg = recommendations[rec_rating_col].mean()
-                st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-value">{:.1f}</div>
-                    <div class="metric-label">Rec Avg Rating</div>
-                </div>
-                """.format(rec_avg), unsafe_allow_html=True)
-            else:
-                st.markdown("""
-                <div class="metric-card">
-                    <div class="metric-value">{}</div>
-                    <div class="metric-label">Recommendations</div>
-                </div>
-                """.format(len(recommendations)), unsafe_allow_html=True)
+    # Metrics row, emitted as a single 4-column grid
+    metric_cards = [
+        ("{:,}".format(summary['total_movies']), "Total Movies"),
+        ("{:.1f}".format(summary['avg_rating']), "Avg Rating"),
+        ("{:,}".format(summary['total_reviews']), "Total Reviews")
+    ]
+    
+    if not recommendations.empty:
+        # Use correct column name for recommendations
+        rec_rating_col = 'avg_rating' if 'avg_rating' in recommendations.columns else 'Average Movie Rating'
+        if rec_rating_col in recommendations.columns:
+            metric_cards.append(("{:.1f}".format(recommendations[rec_rating_col].mean()), "Rec Avg Rating"))
+        else:
+            metric_cards.append(("{}".format(len(recommendations)), "Recommendations"))
+    
+    cards_html = "".join(
+        f'<div class="metric-card"><div class="metric-value">{value}</div>'
+        f'<div class="metric-label">{label}</div></div>'
+        for value, label in metric_cards
+    )
+    st.markdown(
+        f'<div style="display:grid;grid-template-columns:repeat(4,1fr);gap:1rem">{cards_html}</div>',
+        unsafe_allow_html=True
+    )
     
     # Charts
     col1, col2 = st.columns(2)
@@ -555,14 +276,17 @@ def create_analytics_dashboard(movies_stats, recommendations):
         if not recommendations.empty:
             rec_rating_col = 'avg_rating' if 'avg_rating' in recommendations.columns else 'Average Movie Rating'
             if rec_rating_col in recommendations.columns:
-                fig = px.histogram(
-                    recommendations, 
-                    x=rec_rating_col,
-                    title='Rating Distribution of Recommendations',
-                    nbins=20,
-                    color_discrete_sequence=['#e50914']
-                )
+                # Bin in NumPy so only 20 bars are sent to the browser
+                ratings_values = recommendations[rec_rating_col].to_numpy(dtype=float)
+                counts, edges = np.histogram(ratings_values[~np.isnan(ratings_values)], bins=20)
+                fig = go.Figure(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=counts,
+                    width=np.diff(edges),
+                    marker_color='#e50914'
+                ))
                 fig.update_layout(
+                    title='Rating Distribution of Recommendations',
                     plot_bgcolor='rgba(0,0,0,0)',
                     paper_bgcolor='rgba(26,26,26,1)',
                     font_color='white',
@@ -579,8 +303,8 @@ def create_analytics_dashboard(movies_stats, recommendations):
             year_counts = recommendations['year'].value_counts().head(10)
             if not year_counts.empty:
                 fig = px.bar(
-                    x=year_counts.index,
-                    y=year_counts.values,
+                    x=np.asarray(year_counts.index),
+                    y=np.asarray(year_counts.values),
                     title='Top Years in Recommendations',
                     color_discrete_sequence=['#e50914']
                 )
@@ -598,7 +322,7 @@ def create_analytics_dashboard(movies_stats, recommendations):
 def main():
     # Load data
     with st.spinner("🎬 Loading movie database..."):
-        movies, ratings, movies_stats, data_loader = load_movie_data()
+        movies, ratings, movies_stats, data_loader, precomputed = load_movie_data()
     
     if movies_stats is None:
         st.error("Failed to load movie data. Please check if the data files exist.")
@@ -606,6 +330,10 @@ def main():
     
     st.success(f"✅ Loaded {len(movies):,} movies and {len(ratings):,} ratings!")
     
+    available_genres = precomputed['genres']
+    data_version = precomputed['data_version']
+    max_user_id = precomputed['max_user_id']
+    
     # Sidebar controls
     st.sidebar.markdown("## 🎯 Recommendation Settings")
     
@@ -622,156 +350,174 @@ def main():
     min_reviews = None
     k_similar_users = None
     
-    if rec_type == "Popularity-Based":
-        # Popularity: Genre, minimum reviews, num recommendations
-        genres = get_available_genres(movies_stats)
-        selected_genre = st.sidebar.selectbox(
-            "Select Genre",
-            ["All"] + genres,
-            help="Filter movies by genre"
-        )
-        
-        min_reviews = st.sidebar.number_input(
-            "Minimum Reviews Threshold",
-            min_value=1,
-            max_value=1000,
-            value=50,
-            help="Minimum number of reviews required for a movie to be considered"
-        )
-        
-        num_recommendations = st.sidebar.slider(
-            "Number of Recommendations",
-            min_value=5,
-            max_value=50,
-            value=10,
-            help="How many movies to recommend"
-        )
-    
-    elif rec_type == "Content-Based":
-        # Content: Movie title, num recommendations
-        available_movies = movies_stats['movie_name'].dropna().tolist()
-        movie_title = st.sidebar.selectbox(
-            "Select a Movie You Liked",
-            available_movies[:100],  # Limit to first 100 for performance
-            help="Select a movie you enjoyed for similar recommendations"
+    # The search box drives the title options, so it stays outside the form
+    if rec_type == "Content-Based":
+        movie_query = st.sidebar.text_input(
+            "Search Movies",
+            help="Type part of a title to search the full catalog"
         )
         
-        num_recommendations = st.sidebar.slider(
-            "Number of Recommendations",
-            min_value=5,
-            max_value=50,
-            value=10,
-            help="How many movies to recommend"
-        )
-    
-    elif rec_type == "Collaborative Filtering":
-        # Collaborative: User ID, num recommendations, threshold of similar users
-        user_id = st.sidebar.number_input(
-            "User ID",
-            min_value=1,
-            max_value=ratings['userId'].max(),
-            value=1,
-            help="Enter a user ID for collaborative filtering"
-        )
-        
-        num_recommendations = st.sidebar.slider(
-            "Number of Recommendations",
-            min_value=5,
-            max_value=50,
-            value=10,
-            help="How many movies to recommend"
-        )
-        
-        k_similar_users = st.sidebar.number_input(
-            "Number of Similar Users",
-            min_value=10,
-            max_value=500,
-            value=100,
-            help="How many similar users to consider for recommendations"
-        )
-    
-    elif rec_type == "Hybrid":
-        # Hybrid: Can have all filters
-        genres = get_available_genres(movies_stats)
-        selected_genre = st.sidebar.selectbox(
-            "Select Genre",
-            ["All"] + genres,
-            help="Filter movies by genre"
-        )
+        # Only send matching titles to the front-end, not the whole catalog
+        titles = precomputed['titles']
+        if movie_query:
+            titles = titles[np.char.find(precomputed['titles_lower'], movie_query.lower()) >= 0]
+    
+    # Settings are applied on submit, so adjusting a widget doesn't rerun the app
+    with st.sidebar.form("rec_settings", clear_on_submit=False):
+        if rec_type == "Popularity-Based":
+            # Popularity: Genre, minimum reviews, num recommendations
+            selected_genre = st.selectbox(
+                "Select Genre",
+                ["All", *available_genres],
+                help="Filter movies by genre"
+            )
+            
+            min_reviews = st.number_input(
+                "Minimum Reviews Threshold",
+                min_value=1,
+                max_value=1000,
+                value=50,
+                help="Minimum number of reviews required for a movie to be considered"
+            )
+            
+            num_recommendations = st.slider(
+                "Number of Recommendations",
+                min_value=5,
+                max_value=50,
+                value=10,
+                help="How many movies to recommend"
+            )
         
-        user_id = st.sidebar.number_input(
-            "User ID",
-            min_value=1,
-            max_value=ratings['userId'].max(),
-            value=1,
-            help="Enter a user ID for hybrid recommendations"
-        )
+        elif rec_type == "Content-Based":
+            # Content: Movie title, num recommendations
+            movie_title = st.selectbox(
+                "Select a Movie You Liked",
+                titles[:50],
+                help="Select a movie you enjoyed for similar recommendations"
+            )
+            
+            num_recommendations = st.slider(
+                "Number of Recommendations",
+                min_value=5,
+                max_value=50,
+                value=10,
+                help="How many movies to recommend"
+            )
         
-        num_recommendations = st.sidebar.slider(
-            "Number of Recommendations",
-            min_value=5,
-            max_value=50,
-            value=10,
-            help="How many movies to recommend"
-        )
+        elif rec_type == "Collaborative Filtering":
+            # Collaborative: User ID, num recommendations, threshold of similar users
+            user_id = st.number_input(
+                "User ID",
+                min_value=1,
+                max_value=max_user_id,
+                value=1,
+                help="Enter a user ID for collaborative filtering"
+            )
+            
+            num_recommendations = st.slider(
+                "Number of Recommendations",
+                min_value=5,
+                max_value=50,
+                value=10,
+                help="How many movies to recommend"
+            )
+            
+            k_similar_users = st.number_input(
+                "Number of Similar Users",
+                min_value=10,
+                max_value=500,
+                value=100,
+                help="How many similar users to consider for recommendations"
+            )
         
-        min_reviews = st.sidebar.number_input(
-            "Minimum Reviews Threshold",
-            min_value=1,
-            max_value=1000,
-            value=50,
-            help="Minimum number of reviews required for a movie to be considered"
-        )
+        elif rec_type == "Hybrid":
+            # Hybrid: Can have all filters
+            selected_genre = st.selectbox(
+                "Select Genre",
+                ["All", *available_genres],
+                help="Filter movies by genre"
+            )
+            
+            user_id = st.number_input(
+                "User ID",
+                min_value=1,
+                max_value=max_user_id,
+                value=1,
+                help="Enter a user ID for hybrid recommendations"
+            )
+            
+            num_recommendations = st.slider(
+                "Number of Recommendations",
+                min_value=5,
+                max_value=50,
+                value=10,
+                help="How many movies to recommend"
+            )
+            
+            min_reviews = st.number_input(
+                "Minimum Reviews Threshold",
+                min_value=1,
+                max_value=1000,
+                value=50,
+                help="Minimum number of reviews required for a movie to be considered"
+            )
+            
+            k_similar_users = st.number_input(
+                "Number of Similar Users",
+                min_value=10,
+                max_value=500,
+                value=100,
+                help="How many similar users to consider for collaborative part"
+            )
         
-        k_similar_users = st.sidebar.number_input(
-            "Number of Similar Users",
-            min_value=10,
-            max_value=500,
-            value=100,
-            help="How many similar users to consider for collaborative part"
-        )
+        # Generate recommendations button
+        submitted = st.form_submit_button("🎬 Get Recommendations", type="primary")
     
-    # Generate recommendations button
-    if st.sidebar.button("🎬 Get Recommendations", type="primary"):
+    if submitted:
         try:
             recommendations = None
             
             # Initialize recommender based on type
             if rec_type == "Popularity-Based":
                 with st.spinner("🔥 Analyzing movie popularity trends..."):
-                    recommender = PopularityRecommender(movies_stats)
+                    recommender = get_popularity_rec(data_version, movies_stats)
                     genre_filter = None if selected_genre == "All" else selected_genre
-                    recommendations = recommender.recommend(genre_filter, min_reviews, num_recommendations)
+                    recommendations = cached_recommend(data_version, rec_type, recommender, 'recommend',
+                                                       genre_filter, min_reviews, num_recommendations)
                 st.success(f"✅ Generated {len(recommendations)} popularity-based recommendations")
             
             elif rec_type == "Content-Based":
-                with st.spinner("🎭 Analyzing movie content and similarities..."):
-                    recommender = ContentBasedRecommender(movies_stats)
-                    recommendations = recommender.recommend(movie_title, num_recommendations)
-                st.success(f"✅ Generated {len(recommendations)} content-based recommendations")
+                if movie_title is None:
+                    st.warning("No movies match your search. Try a different title.")
+                else:
+                    with st.spinner("🎭 Analyzing movie content and similarities..."):
+                        recommender = get_content_rec(data_version, movies_stats)
+                        recommendations = cached_recommend(data_version, rec_type, recommender, 'recommend',
+                                                           movie_title, num_recommendations)
+                    st.success(f"✅ Generated {len(recommendations)} content-based recommendations")
             
             elif rec_type == "Collaborative Filtering":
                 with st.spinner("👥 Analyzing user preferences and finding similar users..."):
-                    # Correct order: ratings_df first, then movies_df
-                    recommender = CollaborativeFilteringRecommender(ratings, movies_stats)
-                    recommendations = recommender.recommend(user_id, num_recommendations, k_similar_users)
+                    recommender = get_collab_rec(data_version, ratings, movies_stats)
+                    recommendations = cached_recommend(data_version, rec_type, recommender, 'recommend',
+                                                       user_id, num_recommendations, k_similar_users)
                 st.success(f"✅ Generated {len(recommendations)} collaborative filtering recommendations")
             
             elif rec_type == "Hybrid":
                 with st.spinner("🚀 Combining multiple AI algorithms for best results..."):
-                    # HybridRecommender needs individual recommender instances
-                    popularity_rec = PopularityRecommender(movies_stats)
-                    content_rec = ContentBasedRecommender(movies)
-                    collab_rec = CollaborativeFilteringRecommender(ratings, movies_stats)
-                    recommender = HybridRecommender(popularity_rec, content_rec, collab_rec)
-                    recommendations = recommender.get_combined_recommendations(user_id, num_recommendations)
+                    recommender = get_hybrid_rec(data_version, ratings, movies_stats)
+                    recommendations = cached_recommend(data_version, rec_type, recommender, 'get_combined_recommendations',
+                                                       user_id, num_recommendations)
                 st.success(f"✅ Generated {len(recommendations)} hybrid recommendations")
             
             # Store recommendations in session state
             if recommendations is not None and not recommendations.empty:
                 st.session_state.recommendations = recommendations
                 st.session_state.rec_type = rec_type
-                st.balloons()  # Celebration animation
+                # Celebration animation, only for the first recommendations of a session
+                if not st.session_state.get('celebrated'):
+                    st.balloons()
+                    st.session_state.celebrated = True
             else:
                 st.warning("No recommendations generated. Try different parameters.")
             
@@ -786,41 +532,40 @@ def main():
         recommendations = st.session_state.recommendations
         rec_type = st.session_state.rec_type
         
-        # Main content area with professional tabs
-        tab1, tab2, tab3 = st.tabs([
-            "🎬  Movie Recommendations  🎬", 
-            "📊  Analytics Dashboard  📊", 
-            "📋  Detailed View  📋"
-        ])
+        # Main content area; unlike st.tabs, only the selected view is rendered
+        view_labels = {
+            "recommendations": "🎬  Movie Recommendations  🎬",
+            "analytics": "📊  Analytics Dashboard  📊",
+            "detailed": "📋  Detailed View  📋"
+        }
+        active_view = st.radio(
+            "View",
+            list(view_labels),
+            format_func=view_labels.get,
+            horizontal=True,
+            label_visibility='collapsed',
+            key="active_view"
+        )
         
-        with tab1:
+        if active_view == "recommendations":
             display_recommendations_grid(
                 recommendations, 
                 f"🎯 {rec_type} Recommendations"
             )
         
-        with tab2:
-            create_analytics_dashboard(movies_stats, recommendations)
+        elif active_view == "analytics":
+            create_analytics_dashboard(precomputed['summary'], recommendations)
         
-        with tab3:
+        else:
             st.markdown("### 📋 Detailed Recommendations Table")
             
-            # Style the dataframe
-            styled_df = recommendations.style.set_properties(**{
-                'background-color': '#2d2d2d',
-                'color': 'white',
-                'border-color': '#444'
-            }).set_table_styles([
-                {'selector': 'th', 'props': [('background-color', '#e50914'), ('color', 'white')]}
-            ])
-            
-            st.dataframe(styled_df, width='stretch')
+            # Pass the raw frame (no Styler); the theme and .dataframe CSS style it
+            st.dataframe(recommendations, width='stretch', hide_index=True)
             
-            # Download button
-            csv = recommendations.to_csv(index=False)
+            # Download button; the CSV is only serialized when the user clicks it
             st.download_button(
                 label="📥 Download Recommendations as CSV",
-                data=csv,
+                data=lambda: recommendations.to_csv(index=False).encode('utf-8'),
                 file_name=f"{rec_type.lower()}_recommendations.csv",
                 mime="text/csv"
             )
@@ -859,9 +604,7 @@ def main():
         
         # Show some sample popular movies
         try:
-            # Use correct column name for sorting
-            rating_col = 'avg_rating' if 'avg_rating' in movies_stats.columns else 'Average Movie Rating'
-            sample_popular = movies_stats.nlargest(6, rating_col)
+            sample_popular = precomputed['top_rated'].head(6)
             st.markdown("### 🏆 Top Rated Movies (Sample)")
             display_recommendations_grid(sample_popular, "Highest Rated Movies")
         except Exception as e: